@@ -1,40 +1,75 @@
+import asyncio
+import sys
 import time
-import json
+
+from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
 import RNS
 
+_SERVER_NAME = sys.intern("server_name")
+_CLIENT_NAME = sys.intern("client_name")
+
+def parse_display_name(app_data):
+    if not app_data or app_data[:1] != b"{" or app_data[-1:] != b"}":
+        return None
+    return _parse_json_name(app_data)
+
+@lru_cache(maxsize=256)
+def _parse_json_name(app_data):
+    try:
+        app_data_json = _json.loads(app_data)
+        return app_data_json.get(_SERVER_NAME) or app_data_json.get(_CLIENT_NAME)
+    except Exception:
+        return None
+
+_ts_cache = (0, "")
+
+def now_str():
+    global _ts_cache
+    now = int(time.time())
+    cached = _ts_cache
+    if now != cached[0]:
+        cached = _ts_cache = (now, datetime.fromtimestamp(now).isoformat(sep=" ", timespec="seconds"))
+    return cached[1]
+
+@lru_cache(maxsize=1024)
+def pretty_hash(destination_hash):
+    return RNS.prettyhexrep(destination_hash)
+
 class AnnounceHandler:
+    __slots__ = ("app", "aspect_filter")
+
     def __init__(self, app, aspect_filter=None):
         self.app = app
         self.aspect_filter = aspect_filter
 
     def received_announce(self, destination_hash, announced_identity, app_data):
-        dest_hash_raw = destination_hash.hex()
-        dest_hash_display = RNS.prettyhexrep(destination_hash)
-        display_name = dest_hash_display
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
-
-        if app_data:
-            try:
-                app_data_json = json.loads(app_data.decode("utf-8"))
-                if "server_name" in app_data_json:
-                    display_name = app_data_json["server_name"]
-                elif "client_name" in app_data_json:
-                    display_name = app_data_json["client_name"]
-            except json.JSONDecodeError:
-                pass
-
-        announce_message = {
-            "display_name": display_name,
-            "dest_hash": dest_hash_raw,
-            "timestamp": timestamp
-        }
-
-        self.app.servers[dest_hash_raw] = announce_message
-
-        if dest_hash_raw in self.app.address_book:
-            self.app.address_book[dest_hash_raw]["timestamp"] = timestamp
-            self.app.save_address_book()
-            self.app.update_address_book()
-
-        self.app.on_announce(destination_hash, announced_identity, app_data)
\ No newline at end of file
+        display_name = parse_display_name(app_data) or pretty_hash(destination_hash)
+
+        entry = self.app.address_book.get(destination_hash.hex()) if self.app.address_book else None
+        if entry is not None:
+            entry["timestamp"] = now_str()
+            self.app.mark_address_book_dirty()
+
+        self.app.on_announce(destination_hash, announced_identity, app_data, display_name=display_name)
+
+class PathWaiter:
+    __slots__ = ("aspect_filter", "destination_hash", "event", "loop")
+
+    receive_path_responses = True
+
+    def __init__(self, destination_hash, loop, aspect_filter=None):
+        self.aspect_filter = aspect_filter
+        self.destination_hash = destination_hash
+        self.event = asyncio.Event()
+        self.loop = loop
+
+    def received_announce(self, destination_hash, announced_identity, app_data):
+        if destination_hash == self.destination_hash:
+            self.loop.call_soon_threadsafe(self.event.set)
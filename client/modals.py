@@ -4,6 +4,9 @@ from textual.containers import Grid
 from textual.screen import ModalScreen
 from textual.widgets import Button, Label
 
+REMOVE_FROM_ADDRESS_BOOK = "Remove from Address Book"
+SAVE_TO_ADDRESS_BOOK = "Save to Address Book"
+
 class ServerDetailScreen(ModalScreen):
     def __init__(self, server_name, destination_hash, timestamp, on_connect, saved_in_address_book):
         super().__init__()
@@ -12,16 +15,15 @@ class ServerDetailScreen(ModalScreen):
         self.timestamp = timestamp
         self.on_connect = on_connect
         self.saved_in_address_book = saved_in_address_book
+        self._details_text = f"Server Name: {server_name}\nDestination Hash: {destination_hash}\nLast Heard: {timestamp}"
+        self._toggle_label = REMOVE_FROM_ADDRESS_BOOK if saved_in_address_book else SAVE_TO_ADDRESS_BOOK
 
     def compose(self):
         yield Grid(
-            Label(
-                f"Server Name: {self.server_name}\nDestination Hash: {self.destination_hash}\nLast Heard: {self.timestamp}",
-                id="server_details"
-            ),
+            Label(self._details_text, id="server_details"),
             Button("Connect", id="connect", variant="success", classes="button"),
             Button(
-                "Remove from Address Book" if self.saved_in_address_book else "Save to Address Book",
+                self._toggle_label,
                 id="toggle_address_book",
                 variant="primary",
                 classes="button",
@@ -30,32 +32,53 @@ class ServerDetailScreen(ModalScreen):
             id="server_details_dialog",
         )
 
+    def _on_connect(self):
+        asyncio.create_task(self.on_connect(self.destination_hash))
+        self.app.pop_screen()
+
+    def _on_toggle(self):
+        self.app.pop_screen()
+        self.app.toggle_address_book(self.destination_hash, self.saved_in_address_book)
+
+    def _on_close(self):
+        self.app.pop_screen()
+
+    _HANDLERS = {
+        "connect": _on_connect,
+        "toggle_address_book": _on_toggle,
+        "close": _on_close,
+    }
+
     def on_button_pressed(self, event: Button.Pressed):
-        if event.button.id == "connect":
-            asyncio.create_task(self.on_connect(self.destination_hash))
-            self.app.pop_screen()
-        elif event.button.id == "toggle_address_book":
-            self.app.pop_screen()
-            self.app.toggle_address_book(self.destination_hash, self.saved_in_address_book)
-        elif event.button.id == "close":
-            self.app.pop_screen()
+        handler = self._HANDLERS.get(event.button.id)
+        if handler:
+            handler(self)
 
 
 class HelpScreen(ModalScreen):
+    _HELP_TEXT = (
+        "Welcome to the RetiBBS Client!\n\n"
+        "Available Key Bindings:\n"
+        "  q      - Quit the application\n"
+        "  ?      - Show this help screen\n\n"
+        "Use the arrow keys to navigate the interface.\n"
+    )
+
     def compose(self):
-        help_text = (
-            "Welcome to the RetiBBS Client!\n\n"
-            "Available Key Bindings:\n"
-            "  q      - Quit the application\n"
-            "  ?      - Show this help screen\n\n"
-            "Use the arrow keys to navigate the interface.\n"
-        )
         yield Grid(
-            Label(help_text, id="help_text"),
+            Label(self._HELP_TEXT, id="help_text"),
             Button("Close", id="close_help", variant="default", classes="button"),
             id="help_dialog",
         )
 
+    def _on_close(self):
+        self.app.pop_screen()
+
+    _HANDLERS = {
+        "close_help": _on_close,
+    }
+
     def on_button_pressed(self, event: Button.Pressed):
-        if event.button.id == "close_help":
-            self.app.pop_screen()
\ No newline at end of file
+        handler = self._HANDLERS.get(event.button.id)
+        if handler:
+            handler(self)
\ No newline at end of file
@@ -1,31 +1,80 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import collections
+import io
 import json
 import os
-import threading
 import time
 
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical, Grid
-from textual.screen import ModalScreen
 from textual.widgets import Header, Footer, TabbedContent, TabPane, Input, Log, RichLog, DataTable, Static, Button, Label
 
 from rich.text import Text
 
-from announce_handler import AnnounceHandler
+from announce_handler import AnnounceHandler, PathWaiter, now_str, parse_display_name, pretty_hash
 from modals import ServerDetailScreen, HelpScreen
 
 import RNS
 
 PING_INTERVAL = 10
 PING_TIMEOUT = 15
+LATENCY_FORMAT = "Connection Latency (RTT): {:.3f} seconds"
+CONNECT_TIMEOUT = 15
 ADDRESS_BOOK_FILE = "address_book.json"
+ADDRESS_BOOK_SAVE_DELAY = 0.25
+DEFERRED_DEBUG_LOG_SIZE = 500
+RESOURCE_CHUNK_SIZE = 65536
+SERVER_LIST_REFRESH_DELAY = 0.016
+SERVER_LIST_BURST_LOG_THRESHOLD = 500
+LOG_FLUSH_DELAY = 0.016
+
+_HEX = frozenset("0123456789abcdefABCDEF")
+
+ServerInfo = collections.namedtuple("ServerInfo", ("display_name", "hash", "timestamp"))
+
+@lru_cache(maxsize=64)
+def _encode_cmd(command):
+    return command.encode("utf-8")
+
+class Connection:
+    __slots__ = (
+        "link", "server_name", "area", "board", "room",
+        "last_ping", "last_pong", "last_rtt_ms",
+        "running", "hb_task", "mon_task", "loop", "link_ready",
+    )
+
+    def __init__(self, server_name=None):
+        self.link = None
+        self.server_name = server_name
+        self.area = None
+        self.board = None
+        self.room = None
+        self.last_ping = None
+        self.last_pong = None
+        self.last_rtt_ms = None
+        self.running = False
+        self.hb_task = None
+        self.mon_task = None
+        self.loop = None
+        self.link_ready = None
 
 class RetiBBSClient(App):
     CSS_PATH = "app.tcss"
 
+    ASPECT_APP = "retibbs"
+    ASPECT_KIND = "bbs"
+    ASPECT_FILTER = f"{ASPECT_APP}.{ASPECT_KIND}"
+
     BINDINGS = [
         Binding(key="q", action="quit", description="Quit the app"),
         Binding(
@@ -36,22 +85,44 @@ class RetiBBSClient(App):
         )
     ]
 
-    def __init__(self, server_hexhash=None):
+    def __init__(self, server_hexhash=None, debug_mode=False):
         super().__init__()
-        self._deferred_debug_log = []
+        self.debug_mode = debug_mode or bool(os.environ.get("RETIBBS_DEBUG"))
+        self._deferred_debug_log = collections.deque(maxlen=DEFERRED_DEBUG_LOG_SIZE)
+        self._deferred_main_log = collections.deque(maxlen=DEFERRED_DEBUG_LOG_SIZE)
+        self._log_buf = collections.deque()
+        self._debug_buf = collections.deque()
+        self._log_flush_pending = False
         self.server_hexhash = server_hexhash
         self.client_identity = None
-        self.link = None
-        self.servers = {}
+        self.conn = Connection()
+        self._server_index = {}
+        self._server_identities = {}
+        self._server_hashes = []
+        self._server_names = []
+        self._server_timestamps = []
+        self._server_app_data = []
         self.address_book = {}
+        self._address_book_dirty = False
         self.active_tab = "servers"
-        self.server_list_update_pending = False
         self.connection_status = "Not Connected"
-        self.current_server_name = None
-        self.heartbeat_running = False
-        self.monitor_running = False
-        self.last_ping_time = None
-        self.last_pong_time = None
+        self._main_log = None
+        self._debug_log = None
+        self._latency = None
+        self._status = None
+        self._server_table = None
+        self._addr_table = None
+        self._command_input = None
+        self._server_row_keys = {}
+        self._pending_server_rows = {}
+        self._coalesced_announces = 0
+        self._refresh_handle = None
+
+    def get_server(self, destination_hash):
+        idx = self._server_index.get(destination_hash)
+        if idx is None:
+            return None
+        return ServerInfo(self._server_names[idx], self._server_hashes[idx], self._server_timestamps[idx])
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -104,44 +175,113 @@ class RetiBBSClient(App):
         yield Footer()
     
     def load_address_book(self):
-        if os.path.exists(ADDRESS_BOOK_FILE):
-            try:
-                with open(ADDRESS_BOOK_FILE, "r") as file:
-                    address_book = json.load(file)
-                    #DEBUG: self._deferred_debug_log.append(f"[DEBUG] Address book loaded: {address_book}")
-                    return address_book
-            except Exception as e:
-                self._deferred_debug_log.append(f"[ERROR] Error loading address book: {e}")
+        try:
+            with open(ADDRESS_BOOK_FILE, "rb") as file:
+                data = file.read()
+            address_book = orjson.loads(data) if orjson else json.loads(data)
+            #DEBUG: self.write_debug_log(f"[DEBUG] Address book loaded: {address_book}")
+            return address_book
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error loading address book: {e}")
         return {}
     
+    def serialize_address_book(self):
+        if orjson:
+            return orjson.dumps(self.address_book, option=orjson.OPT_INDENT_2)
+        return json.dumps(self.address_book, indent=4).encode("utf-8")
+
+    @staticmethod
+    def write_address_book_file(data):
+        tmp_path = ADDRESS_BOOK_FILE + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(data)
+        os.replace(tmp_path, ADDRESS_BOOK_FILE)
+
     def save_address_book(self):
-        with open(ADDRESS_BOOK_FILE, "w") as file:
-            json.dump(self.address_book, file, indent=4)
+        self.write_address_book_file(self.serialize_address_book())
 
-    def write_debug_log(self, message):
+    def mark_address_book_dirty(self):
+        if self._address_book_dirty:
+            return
+        self._address_book_dirty = True
+        self.call_later(self.set_timer, ADDRESS_BOOK_SAVE_DELAY, self.flush_address_book)
+
+    async def flush_address_book(self):
+        if not self._address_book_dirty:
+            return
+        self._address_book_dirty = False
         try:
-            debug_log = self.query_one("#debug_log", Log)
-            debug_log.write_line(message)
-        except Exception:
-            if not hasattr(self, "_deferred_debug_log"):
-                self._deferred_debug_log = []
+            data = self.serialize_address_book()
+            await asyncio.to_thread(self.write_address_book_file, data)
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error saving address book: {e}")
+
+    def write_debug_log(self, message):
+        if self._debug_log is None:
             self._deferred_debug_log.append(message)
+            return
+        self._debug_buf.append(message)
+        self._schedule_log_flush()
     
     def write_log(self, message):
-        log = self.query_one(RichLog)
-        log.write(message)
+        if self._main_log is None:
+            self._deferred_main_log.append(message)
+            return
+        self._log_buf.append(message)
+        self._schedule_log_flush()
+
+    def clear_log(self):
+        self._log_buf.clear()
+        self._main_log.clear()
+
+    def _schedule_log_flush(self):
+        if not self._log_flush_pending:
+            self._log_flush_pending = True
+            self.call_later(self.set_timer, LOG_FLUSH_DELAY, self._flush_logs)
+
+    def _flush_logs(self):
+        self._log_flush_pending = False
+        # The buffers may be appended to or cleared from the Reticulum thread while draining.
+        log_buf = self._log_buf
+        while log_buf:
+            try:
+                message = log_buf.popleft()
+            except IndexError:
+                break
+            # Write each message on its own so bad markup only loses that message.
+            try:
+                self._main_log.write(message)
+            except Exception as e:
+                self._debug_buf.append(f"[ERROR] Error writing log message: {e}")
+        debug_buf = self._debug_buf
+        lines = []
+        while debug_buf:
+            try:
+                lines.append(debug_buf.popleft())
+            except IndexError:
+                break
+        if lines:
+            self._debug_log.write_lines(lines)
 
     def load_or_create_identity(self, identity_path=None):
         if not identity_path:
             identity_path = f"{RNS.Reticulum.storagepath}/retibbs_client_identity"
 
-        if os.path.exists(identity_path):
-            identity = RNS.Identity.from_file(identity_path)
-            RNS.log(f"[INIT] Loaded existing identity from {identity_path}. Hash: {identity.hash.hex()}")
-        else:
+        try:
+            with open(identity_path, "rb") as file:
+                identity_bytes = file.read()
+        except FileNotFoundError:
             identity = RNS.Identity()
             identity.to_file(identity_path)
             RNS.log(f"[INIT] Created new identity and saved to {identity_path}. Hash: {identity.hash.hex()}")
+            return identity
+
+        identity = RNS.Identity.from_bytes(identity_bytes)
+        if identity is None:
+            raise ValueError(f"Could not load identity from {identity_path}")
+        RNS.log(f"[INIT] Loaded existing identity from {identity_path}. Hash: {identity.hash.hex()}")
         return identity
 
     def initialize_reticulum(self):
@@ -156,10 +296,11 @@ class RetiBBSClient(App):
             self.write_debug_log(f"[INIT] Error initializing Reticulum: {e}")
             raise e
 
-    def initialize_client(self):
+    async def initialize_client(self):
         try:
             self.write_debug_log(f"[INIT] Using identity file: {self.identity_file_path or 'default'}")
-            self.client_identity = self.load_or_create_identity(self.identity_file_path)
+            # Key generation and file I/O run on a worker thread to keep the UI responsive.
+            self.client_identity = await asyncio.to_thread(self.load_or_create_identity, self.identity_file_path)
             self.write_debug_log(f"[INIT] Client identity hash: {self.client_identity.hash.hex()}")
             self.register_announce_handler()
         except Exception as e:
@@ -168,7 +309,7 @@ class RetiBBSClient(App):
 
     def register_announce_handler(self):
         try:
-            self.announce_handler = AnnounceHandler(app=self, aspect_filter="retibbs.bbs")
+            self.announce_handler = AnnounceHandler(app=self, aspect_filter=self.ASPECT_FILTER)
             RNS.Transport.register_announce_handler(self.announce_handler)
             self.write_debug_log("[INIT] Announce handler registered.")
         except Exception as e:
@@ -178,24 +319,30 @@ class RetiBBSClient(App):
     async def on_mount(self):
         self.title = "- RetiBBS Client -"
 
-        server_list = self.query_one("#server_list", DataTable)
-        if not server_list.columns:
-            server_list.add_columns("Server Name", "Destination Hash")
+        self._main_log = self.query_one("#main_log", RichLog)
+        self._debug_log = self.query_one("#debug_log", Log)
+        self._latency = self.query_one("#connection_latency", Static)
+        self._status = self.query_one("#connection_status", Static)
+        self._server_table = self.query_one("#server_list", DataTable)
+        self._addr_table = self.query_one("#address_book", DataTable)
+        self._command_input = self.query_one("#command_input", Input)
 
-        address_book = self.query_one("#address_book", DataTable)
-        if not address_book.columns:
-            address_book.add_columns("Server Name", "Destination Hash")
+        if not self._server_table.columns:
+            self._server_table.add_column("Server Name", key="name")
+            self._server_table.add_column("Destination Hash", key="hash")
 
-        if hasattr(self, "_deferred_debug_log"):
-            for message in self._deferred_debug_log:
-                try:
-                    debug_log = self.query_one("#debug_log", Log)
-                    debug_log.write_line(message)
-                except Exception:
-                    continue
+        if not self._addr_table.columns:
+            self._addr_table.add_column("Server Name", key="name")
+            self._addr_table.add_column("Destination Hash", key="hash")
+
+        if self._deferred_debug_log:
+            self._debug_log.write_lines(self._deferred_debug_log)
             self._deferred_debug_log.clear()
 
-        self.address_book = self.load_address_book()
+        while self._deferred_main_log:
+            self._main_log.write(self._deferred_main_log.popleft())
+
+        self.address_book = await asyncio.to_thread(self.load_address_book)
         self.update_address_book()
 
         self.update_connection_status()
@@ -210,7 +357,7 @@ class RetiBBSClient(App):
 
         self.write_log("Initializing client...")
         try:
-            self.initialize_client()
+            await self.initialize_client()
             self.write_log("Client initialized.\n\nWelcome to RetiBBS!\n\n")
         except Exception as e:
             self.write_log(f"Error initializing client: {e}")
@@ -223,74 +370,95 @@ class RetiBBSClient(App):
     
     async def action_quit(self) -> None:
         try:
-            if self.link and self.link.status == RNS.Link.ACTIVE:
+            link = self.conn.link
+            if link and link.status == RNS.Link.ACTIVE:
                 self.write_debug_log("[QUIT] Closing active link to the server.")
-                self.link.teardown()
+                link.teardown()
                 await asyncio.sleep(1)
-                self.on_link_closed(self.link)
+                self.on_link_closed(link)
             else:
                 self.write_debug_log("[QUIT] No active link to close.")
         except Exception as e:
             self.write_debug_log(f"[QUIT] Error during cleanup: {e}")
         finally:
+            await self.flush_address_book()
             try:
                 RNS.exit()
             except SystemExit:
                 self.write_debug_log("[QUIT] Program exited via Reticulum.")
             self.exit()
 
+    def on_unmount(self):
+        # Covers exits that bypass action_quit; the loop may no longer run the timer.
+        if self._address_book_dirty:
+            self._address_book_dirty = False
+            try:
+                self.save_address_book()
+            except Exception as e:
+                RNS.log(f"[CLIENT] Error saving address book: {e}", RNS.LOG_ERROR)
+
     def action_show_help(self):
         self.push_screen(HelpScreen())
 
     def update_connection_status(self):
-        if self.link and self.link.status == RNS.Link.ACTIVE:
+        conn = self.conn
+        if conn.link and conn.link.status == RNS.Link.ACTIVE:
             indicator = Text("\u2713 ", style="bold green")
-            status = f"Connected to {self.current_server_name or 'Unknown Server'}"
-            if hasattr(self, "current_area") and self.current_area:
-                status += f" | {self.current_area}"
-                if hasattr(self, "current_board") and self.current_board:
-                    status += f" | Board: {self.current_board}"
-                elif hasattr(self, "current_room") and self.current_room:
-                    status += f" | Room: {self.current_room}"
+            status = f"Connected to {conn.server_name or 'Unknown Server'}"
+            if conn.area:
+                status += f" | {conn.area}"
+                if conn.board:
+                    status += f" | Board: {conn.board}"
+                elif conn.room:
+                    status += f" | Room: {conn.room}"
         else:
             indicator = Text("\u2715  ", style="bold red")
             status = "Not Connected"
-            latency_widget = self.query_one("#connection_latency", Static)
-            latency_widget.visible = False
-        status_widget = self.query_one("#connection_status", Static)
-        status_widget.update(indicator + Text(status))
+            self._latency.visible = False
+        self._status.update(indicator + Text(status))
 
     async def connect_client(self, destination_hash=None):
-        self.last_ping_time = None
-        self.last_pong_time = None
+        loop = asyncio.get_running_loop()
 
         server_hexhash = destination_hash or self.server_hexhash
         if not server_hexhash:
             self.write_log("[CONNECT] Failed: No server hexhash provided.")
-            self.update_connection_status()
             return
 
+        if len(server_hexhash) != RNS.Reticulum.TRUNCATED_HASHLENGTH // 4 or not _HEX.issuperset(server_hexhash):
+            self.write_log(f"[CONNECT] Failed: Invalid server hexhash: {server_hexhash}.")
+            return
+
+        previous_link = self.reset_connection()
+        if previous_link:
+            previous_link.teardown()
+        conn = self.conn
+
         try:
             try:
-                server_info = self.address_book.get(server_hexhash) or self.servers.get(server_hexhash)
-                self.current_server_name = server_info.get("display_name", "Unknown Server") if server_info else "Unknown Server"
-                self.update_connection_status()
                 server_addr = bytes.fromhex(server_hexhash)
+                server_info = self.address_book.get(server_hexhash)
+                if server_info:
+                    conn.server_name = server_info.get("display_name", "Unknown Server")
+                else:
+                    server = self.get_server(server_addr)
+                    conn.server_name = server.display_name if server else "Unknown Server"
+                self.update_connection_status()
             except ValueError:
                 self.write_log(f"[CONNECT] Failed: Invalid server hexhash: {server_hexhash}.")
                 return
 
             if not RNS.Transport.has_path(server_addr):
                 self.write_log("[CONNECT] Path to server unknown, requesting path...")
-                RNS.Transport.request_path(server_addr)
-                timeout_t0 = asyncio.get_event_loop().time()
-                while not RNS.Transport.has_path(server_addr):
-                    if asyncio.get_event_loop().time() - timeout_t0 > 15:
-                        self.write_log("[CONNECT] Failed: Timed out waiting for path.")
-                        return
-                    await asyncio.sleep(0.1)
-
-            server_identity = RNS.Identity.recall(server_addr)
+                if not await self.wait_for_path(server_addr, loop):
+                    self.write_log("[CONNECT] Failed: Timed out waiting for path.")
+                    return
+
+            server_identity = self._server_identities.get(server_addr)
+            if server_identity is None:
+                server_identity = RNS.Identity.recall(server_addr)
+                if server_identity:
+                    self._server_identities[server_addr] = server_identity
             if not server_identity:
                 self.write_log("[CONNECT] Failed: Could not recall server Identity.")
                 self.update_connection_status()
@@ -300,141 +468,160 @@ class RetiBBSClient(App):
                 server_identity,
                 RNS.Destination.OUT,
                 RNS.Destination.SINGLE,
-                "retibbs",
-                "bbs"
+                self.ASPECT_APP,
+                self.ASPECT_KIND
             )
 
-            self.link = RNS.Link(server_destination)
-            self.link.set_link_established_callback(self.on_link_established)
-            self.link.set_link_closed_callback(self.on_link_closed)
-            self.link.set_packet_callback(self.on_packet_received)
+            conn.loop = loop
+            conn.link_ready = asyncio.Event()
+            conn.link = link = RNS.Link(server_destination)
+            link.set_link_established_callback(self.on_link_established)
+            link.set_link_closed_callback(self.on_link_closed)
+            link.set_packet_callback(self.on_packet_received)
 
             # IMPORTANT: may need a refactoring to use a more restrictive resource strategy
-            self.link.set_resource_strategy(RNS.Link.ACCEPT_ALL)
-            self.link.set_resource_started_callback(self.on_resource_started)
-            self.link.set_resource_concluded_callback(self.on_resource_concluded)
+            link.set_resource_strategy(RNS.Link.ACCEPT_ALL)
+            link.set_resource_started_callback(self.on_resource_started)
+            link.set_resource_concluded_callback(self.on_resource_concluded)
 
             self.write_log("[CONNECT] Establishing link with server...")
-            await self.wait_for_link()
+            await self.wait_for_link(conn)
 
-            if self.link.status == RNS.Link.ACTIVE:
+            if link.status == RNS.Link.ACTIVE:
                 self.write_log("[CONNECT] Link is ACTIVE. Now identifying to server...")
-                self.link.identify(self.client_identity)
+                link.identify(self.client_identity)
                 self.write_log("[CONNECT] Successfully connected to the server.\n\n")
                 self.update_connection_status()
                 try:
-                    self.heartbeat_running = True
-                    self.monitor_running = True
-                    self.start_heartbeat()
-                    self.start_connection_monitor()
+                    conn.running = True
+                    conn.hb_task = asyncio.create_task(self._heartbeat_loop(conn))
+                    conn.mon_task = asyncio.create_task(self._monitor_loop(conn))
                     self.write_debug_log("[CONNECT] Connection monitoring started.")
                 except Exception as e:
                     self.write_log(f"[CONNECT] Error starting connection monitoring: {e}")
             else:
                 self.write_log("[CONNECT] Failed: Link could not be established.\n\n")
-                self.link = None
-                self.current_server_name = None
-                self.heartbeat_running = False
-                self.monitor_running = False
+                if self.conn is conn:
+                    self.conn = Connection()
+                link.teardown()
                 self.update_connection_status()
 
         except Exception as e:
             self.write_log(f"[CONNECT] Failed: Error connecting to server: {e}")
-            self.current_server_name = None
+            if self.conn is conn:
+                self.conn = Connection()
+            if conn.link:
+                conn.link.teardown()
             self.update_connection_status()
 
-    async def wait_for_link(self):
-        timeout_t0 = asyncio.get_event_loop().time()
-        while self.link.status != RNS.Link.ACTIVE:
-            if asyncio.get_event_loop().time() - timeout_t0 > 15:
-                self.query_one("#main_log", Log).write_line("[CONNECT] Failed: Timed out waiting for link.")
-                return
-            await asyncio.sleep(0.1)
+    async def wait_for_path(self, server_addr, loop):
+        waiter = PathWaiter(server_addr, loop, aspect_filter=self.ASPECT_FILTER)
+        RNS.Transport.register_announce_handler(waiter)
+        try:
+            RNS.Transport.request_path(server_addr)
+            if not RNS.Transport.has_path(server_addr):
+                await asyncio.wait_for(waiter.event.wait(), timeout=CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            RNS.Transport.deregister_announce_handler(waiter)
+        return RNS.Transport.has_path(server_addr)
+
+    async def wait_for_link(self, conn):
+        try:
+            await asyncio.wait_for(conn.link_ready.wait(), timeout=CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.write_log("[CONNECT] Failed: Timed out waiting for link.")
     
     def on_link_established(self, link):
+        # Called from the Reticulum thread.
+        conn = self.conn
+        if link is not conn.link:
+            # A link from an abandoned connect attempt finished late.
+            link.teardown()
+            return
+        conn.loop.call_soon_threadsafe(conn.link_ready.set)
         #DEBUG: self.write_debug_log("[DEBUG] Link established!")
         #DEBUG: self.write_debug_log(f"[DEBUG] Link status: {link.status}")
-        main_screen = self.query_one("#main_log", RichLog)
-        main_screen.clear()
-        latency_widget = self.query_one("#connection_latency", Static)
-        latency_widget.update(f"Connection Latency (RTT): [CALCULATING]")
-        latency_widget.visible = True
-    
-    def start_heartbeat(self):
-        def heartbeat():
-            try:
-                #DEBUG: self.write_debug_log("[DEBUG] Starting heartbeat thread...")
-                while self.heartbeat_running:
-                    if self.link and self.link.status == RNS.Link.ACTIVE:
-                        self.send_ping()
-                    time.sleep(PING_INTERVAL)
-            except Exception as e:
-                self.write_debug_log(f"[ERROR] Error in heartbeat thread: {e}")
-        
-        self.write_debug_log("[INIT] Heartbeat thread started.")
-        threading.Thread(target=heartbeat, daemon=True).start()
+        self.clear_log()
+        conn.last_rtt_ms = None
+        self._latency.update(f"Connection Latency (RTT): [CALCULATING]")
+        self._latency.visible = True
     
-    def start_connection_monitor(self):
-        def monitor():
-            try:
-                #DEBUG: self.write_debug_log("[DEBUG] Starting connection monitor thread...")
-                while self.monitor_running:
-                    self.check_pong_timeout()
-                    time.sleep(1)
-            except Exception as e:
-                self.write_debug_log(f"[ERROR] Error in connection monitor thread: {e}")
-        self.write_debug_log("[INIT] Connection monitor thread started.")
-        threading.Thread(target=monitor, daemon=True).start()
+    async def _heartbeat_loop(self, conn):
+        try:
+            #DEBUG: self.write_debug_log("[DEBUG] Starting heartbeat task...")
+            while conn.running:
+                if conn.link and conn.link.status == RNS.Link.ACTIVE:
+                    self.send_ping(conn)
+                await asyncio.sleep(PING_INTERVAL)
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error in heartbeat task: {e}")
+
+    async def _monitor_loop(self, conn):
+        try:
+            #DEBUG: self.write_debug_log("[DEBUG] Starting connection monitor task...")
+            while conn.running:
+                self.check_pong_timeout(conn)
+                await asyncio.sleep(1)
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error in connection monitor task: {e}")
+
+    def stop_connection_tasks(self):
+        conn = self.conn
+        conn.running = False
+        for task in (conn.hb_task, conn.mon_task):
+            if task and not task.done():
+                # May be called from the Reticulum thread via on_link_closed.
+                task.get_loop().call_soon_threadsafe(task.cancel)
+        conn.hb_task = None
+        conn.mon_task = None
     
-    def send_ping(self):
+    def send_ping(self, conn):
         try:
-            self.last_ping_time = time.time()
-            packet = RNS.Packet(self.link, b"PING")
+            conn.last_ping = time.monotonic()
+            packet = RNS.Packet(conn.link, b"PING")
             packet.send()
             #DEBUG: self.write_debug_log("[DEBUG] Sent PING to server.")
         except Exception as e:
             self.write_log(f"[Client] Error sending PING: {e}")
     
-    def check_pong_timeout(self):
-        if self.last_pong_time:
-            time_since_last_pong = time.time() - self.last_pong_time
+    def check_pong_timeout(self, conn):
+        if conn.last_pong:
+            time_since_last_pong = time.monotonic() - conn.last_pong
             #DEBUG: self.write_debug_log(f"[DEBUG] Time since last PONG: {time_since_last_pong:.3f} seconds")
             if time_since_last_pong > PING_TIMEOUT:
                 self.write_log("[Client] No PONG received within timeout.")
                 self.teardown_connection()
     
-    def teardown_connection(self):
-        self.heartbeat_running = False
-        self.monitor_running = False
-        self.last_ping_time = None
-        self.last_pong_time = None
-        latency_widget = self.query_one("#connection_latency", Static)
-        latency_widget.visible = False
-        if self.link:
-            self.link.teardown()
-            self.link = None
-        self.current_server_name = None
-        self.current_board = None
+    def reset_connection(self):
+        link = self.conn.link
+        self.stop_connection_tasks()
+        self.conn = Connection()
+        self._latency.visible = False
         self.update_connection_status()
+        return link
+
+    def teardown_connection(self):
+        link = self.reset_connection()
+        if link:
+            link.teardown()
         self.write_log("Connection lost.")
 
     def on_link_closed(self, link):
-        self.heartbeat_running = False
-        self.monitor_running = False
-        self.last_ping_time = None
-        self.last_pong_time = None
-        latency_widget = self.query_one("#connection_latency", Static)
-        latency_widget.visible = False
-        self.link = None
-        self.current_server_name = None
-        self.current_board = None
-        self.update_connection_status()
+        conn = self.conn
+        if link is not conn.link:
+            # Already replaced or torn down by us; the current connection is unaffected.
+            return
+        if conn.link_ready is not None and not conn.link_ready.is_set():
+            # Wake a pending wait_for_link so a refused link fails at once instead of timing out.
+            conn.loop.call_soon_threadsafe(conn.link_ready.set)
+        self.reset_connection()
         self.write_log("Disconnected from the RetiBBS server.")
 
     def on_resource_started(self, resource):
-        input_box = self.query_one("#command_input", Input)
-        input_box.disabled = True
-        input_box.placeholder = "Receiving Data..."
+        self._command_input.disabled = True
+        self._command_input.placeholder = "Receiving Data..."
         #DEBUG: self.write_debug_log(f"[RESOURCE] Started (size={resource.size})")
 
     def on_resource_concluded(self, resource):
@@ -442,158 +629,245 @@ class RetiBBSClient(App):
             try:
                 fileobj = resource.data
                 fileobj.seek(0)
-                data = fileobj.read()
-                text = data.decode("utf-8", "ignore")
-                self.write_log(f"{text}")
+                data = fileobj.read(RESOURCE_CHUNK_SIZE)
+                if len(data) < RESOURCE_CHUNK_SIZE:
+                    # Common small resource: one decode, no stream wrapper.
+                    if data:
+                        self.write_log(data.decode("utf-8", "ignore"))
+                else:
+                    fileobj.seek(0)
+                    self._write_resource_stream(fileobj)
                 #DEBUG: self.write_debug_log(f"[RESOURCE] Received data (size={resource.size})")
             except Exception as e:
                 self.write_log(f"[RESOURCE] Error processing resource data: {e}")
         else:
             self.write_log("Transfer concluded, but no data received!")
 
-        input_box = self.query_one("#command_input", Input)
-        input_box.disabled = False
-        input_box.placeholder = "Enter command..."
-        input_box.focus()
+        self._command_input.disabled = False
+        self._command_input.placeholder = "Enter command..."
+        self._command_input.focus()
+
+    def _write_resource_stream(self, fileobj):
+        reader = io.TextIOWrapper(fileobj, encoding="utf-8", errors="ignore")
+        try:
+            written = False
+            pending = reader.read(RESOURCE_CHUNK_SIZE)
+            for chunk in iter(lambda: reader.read(RESOURCE_CHUNK_SIZE), ""):
+                # Large resource: write whole lines as they arrive.
+                head, sep, pending = (pending + chunk).rpartition("\n")
+                if sep:
+                    self.write_log(head)
+                    written = True
+            if pending or not written:
+                self.write_log(pending)
+        finally:
+            reader.detach()
+
+    def _handle_ctrl_cls(self, payload):
+        self.clear_log()
+
+    def _handle_ctrl_area(self, payload):
+        try:
+            area_name = payload.decode("utf-8", "ignore").strip()
+            conn = self.conn
+            conn.area = area_name
+            self.write_debug_log(f"[INFO] Area update: {area_name}")
+            #if conn.area != "Message Boards":
+            #    conn.board = None
+            if conn.area == "Main Menu":
+                conn.board = None
+                conn.room = None
+            self.update_connection_status()
+        except Exception as e:
+            self.write_log(f"[SERVER-PACKET] Error processing area update: {e}")
+
+    def _handle_ctrl_board(self, payload):
+        try:
+            board_name = payload.decode("utf-8", "ignore").strip()
+            self.conn.board = board_name
+            self.write_debug_log(f"[INFO] Board update: {board_name}")
+            self.update_connection_status()
+        except Exception as e:
+            self.write_log(f"[SERVER-PACKET] Error processing board update: {e}")
+
+    def _handle_ctrl_room(self, payload):
+        try:
+            room_name = payload.decode("utf-8", "ignore").strip()
+            self.conn.room = room_name
+            self.write_debug_log(f"[INFO] Room update: {room_name}")
+            self.update_connection_status()
+        except Exception as e:
+            self.write_log(f"[SERVER-PACKET] Error processing room update: {e}")
+
+    _CTRL_HANDLERS = {
+        b"CLS": _handle_ctrl_cls,
+        b"AREA": _handle_ctrl_area,
+        b"BOARD": _handle_ctrl_board,
+        b"ROOM": _handle_ctrl_room,
+    }
 
     def on_packet_received(self, message_bytes, packet):
         if message_bytes == b"PONG":
-            self.last_pong_time = time.time()
-            round_trip_time = self.last_pong_time - self.last_ping_time
-            latency_widget = self.query_one("#connection_latency", Static)
-            latency_widget.update(f"Connection Latency (RTT): {round_trip_time:.3f} seconds")
+            conn = self.conn
+            conn.last_pong = time.monotonic()
+            round_trip_time = conn.last_pong - conn.last_ping
+            rtt_ms = int(round_trip_time * 1000)
+            if rtt_ms != conn.last_rtt_ms:
+                conn.last_rtt_ms = rtt_ms
+                self._latency.update(LATENCY_FORMAT.format(round_trip_time))
             return
-        elif message_bytes.startswith(b"CTRL CLS"):
-            main_screen = self.query_one("#main_log", RichLog)
-            main_screen.clear()
-        elif message_bytes.startswith(b"CTRL AREA"):
-            try:
-                decoded_message = message_bytes.decode("utf-8")
-                area_name = decoded_message[len("CTRL AREA "):].strip()
-                self.current_area = area_name
-                self.write_debug_log(f"[INFO] Area update: {area_name}")
-                #if self.current_area != "Message Boards":
-                #    self.current_board = None
-                if self.current_area == "Main Menu":
-                    self.current_board = None
-                    self.current_room = None
-                self.update_connection_status()
-            except Exception as e:
-                self.write_log(f"[SERVER-PACKET] Error processing area update: {e}")
-        elif message_bytes.startswith(b"CTRL BOARD"):
-            try:
-                decoded_message = message_bytes.decode("utf-8")
-                board_name = decoded_message[len("CTRL BOARD "):].strip()
-                self.current_board = board_name
-                self.write_debug_log(f"[INFO] Board update: {board_name}")
-                self.update_connection_status()
-            except Exception as e:
-                self.write_log(f"[SERVER-PACKET] Error processing board update: {e}")
-        elif message_bytes.startswith(b"CTRL ROOM"):
-            try:
-                decoded_message = message_bytes.decode("utf-8")
-                room_name = decoded_message[len("CTRL ROOM "):].strip()
-                self.current_room = room_name
-                self.write_debug_log(f"[INFO] Room update: {room_name}")
-                self.update_connection_status()
-            except Exception as e:
-                self.write_log(f"[SERVER-PACKET] Error processing room update: {e}")
-        else:
+
+        if message_bytes[:5] == b"CTRL ":
+            verb, _, payload = message_bytes[5:].partition(b" ")
+            handler = self._CTRL_HANDLERS.get(verb)
+            if handler:
+                handler(self, payload)
+                return
+
+        try:
             try:
-                text = message_bytes.decode("utf-8", "ignore")
-                self.write_log(f"{text}")
+                text = message_bytes.decode("utf-8")
             except UnicodeDecodeError as e:
-                self.write_log(f"[ERROR] Error decoding packet data: {e}")
-                self.write_log(f"[ERROR] Non-UTF-8 packet data: {message_bytes.data.hex()}")
-            except Exception as e:
-                self.write_log(f"[SERVER-PACKET] Error processing packet: {e}")
+                self.write_debug_log(f"[ERROR] Error decoding packet data: {e}")
+                if self.debug_mode:
+                    self.write_debug_log(f"[DEBUG] Non-UTF-8 packet data: {message_bytes.hex()}")
+                else:
+                    self.write_debug_log(f"[DEBUG] Non-UTF-8 packet data: {len(message_bytes)} bytes")
+                text = message_bytes.decode("utf-8", "ignore")
+            self.write_log(f"{text}")
+        except Exception as e:
+            self.write_log(f"[SERVER-PACKET] Error processing packet: {e}")
 
     async def on_input_submitted(self, message: Input.Submitted):
         command = message.value.strip()
+        message.input.value = ""
         if command:
             self.write_debug_log(f"\nCommand: {command}")
-            if self.link and self.link.status == RNS.Link.ACTIVE:
+            link = self.conn.link
+            if link and link.status == RNS.Link.ACTIVE:
                 try:
-                    packet = RNS.Packet(self.link, command.encode("utf-8"))
-                    packet.send()
+                    if not await asyncio.to_thread(self._send_packet, link, _encode_cmd(command)):
+                        self.write_log("Not connected to a server.")
                 except Exception as e:
                     self.write_log(f"Error sending command: {e}")
             else:
                 self.write_log("Not connected to a server.")
-        message.input.value = ""
 
-    def on_announce(self, destination_hash, announced_identity, app_data):
+    @staticmethod
+    def _send_packet(link, payload):
+        # The link may have closed while this call was queued.
+        if link.status != RNS.Link.ACTIVE:
+            return False
+        RNS.Packet(link, payload).send()
+        return True
+
+    def on_announce(self, destination_hash, announced_identity, app_data, display_name=None):
         # TOREMOVE: Debug log
         #self.write_debug_log("[ANNOUNCE] [Callback] Received announce packet.")
 
-        dest_hash_hex = destination_hash.hex()
-        display_name = RNS.prettyhexrep(destination_hash)
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+        timestamp = now_str()
+        idx = self._server_index.get(destination_hash)
+        if idx is not None and self._server_app_data[idx] == app_data:
+            # Known server re-announcing unchanged data: only the timestamp moves.
+            self._server_timestamps[idx] = timestamp
+            return
 
-        if app_data:
-            try:
-                app_data_json = json.loads(app_data.decode("utf-8"))
-                if "server_name" in app_data_json:
-                    display_name = app_data_json["server_name"]
-            except json.JSONDecodeError:
-                pass
-
-        self.servers[dest_hash_hex] = {
-            "display_name": display_name,
-            "hash": dest_hash_hex,
-            "timestamp": timestamp,
-        }
-
-        self.call_later(self.update_server_list)
+        if display_name is None:
+            display_name = parse_display_name(app_data) or pretty_hash(destination_hash)
+
+        if idx is None:
+            dest_hash_hex = destination_hash.hex()
+            self._server_hashes.append(dest_hash_hex)
+            self._server_names.append(display_name)
+            self._server_timestamps.append(timestamp)
+            self._server_app_data.append(app_data)
+            self._server_index[destination_hash] = len(self._server_names) - 1
+        else:
+            previous_name = self._server_names[idx]
+            self._server_names[idx] = display_name
+            self._server_timestamps[idx] = timestamp
+            self._server_app_data[idx] = app_data
+            if previous_name == display_name:
+                return
+            dest_hash_hex = self._server_hashes[idx]
+
+        # Called from the Reticulum thread; the pending rows are only touched on the UI thread.
+        self.call_later(self._queue_server_row, dest_hash_hex, display_name)
     
         self.write_debug_log(f"[ANNOUNCE] Discovered server: {display_name} ({dest_hash_hex})")
 
-    def update_server_list(self):
+    def _queue_server_row(self, dest_hash_hex, display_name):
+        self._pending_server_rows[dest_hash_hex] = display_name
+        self._coalesced_announces += 1
+        if self._refresh_handle is None:
+            self._refresh_handle = self.set_timer(SERVER_LIST_REFRESH_DELAY, self._flush_server_updates)
+
+    def _flush_server_updates(self):
+        self._refresh_handle = None
+        pending, self._pending_server_rows = self._pending_server_rows, {}
+        coalesced, self._coalesced_announces = self._coalesced_announces, 0
+        if coalesced > SERVER_LIST_BURST_LOG_THRESHOLD:
+            self.write_debug_log(f"[ANNOUNCE] Coalesced {coalesced} announces into {len(pending)} server list updates.")
         try:
-            if len(self.screen_stack) > 1 and isinstance(self.screen_stack[-1], ModalScreen):
-                if not self.server_list_update_pending:
-                    self.server_list_update_pending = True
-                    self.write_debug_log("[INFO] Modal is active, deferring server list update.")
-                    self.call_later(self.update_server_list)
-                return
+            self._apply_server_rows(pending)
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error updating server list: {e}")
 
-            self.server_list_update_pending = False
-            server_list = self.query_one("#server_list", DataTable)
-            server_list.clear()
-            for server in self.servers.values():
-                server_list.add_row(server["display_name"], server["hash"])
+    def _apply_server_rows(self, rows):
+        new_rows = []
+        for dest_hash_hex, display_name in rows.items():
+            row_key = self._server_row_keys.get(dest_hash_hex)
+            if row_key is None:
+                new_rows.append((display_name, dest_hash_hex))
+            elif self._server_table.get_cell(row_key, "name") != display_name:
+                self._server_table.update_cell(row_key, "name", display_name)
+        if new_rows:
+            row_keys = self._server_table.add_rows(new_rows)
+            self._server_row_keys.update(zip((dest_hash_hex for _, dest_hash_hex in new_rows), row_keys))
+
+    def update_server_list(self):
+        try:
+            current = dict(zip(self._server_hashes, self._server_names))
+            for dest_hash_hex in self._server_row_keys.keys() - current.keys():
+                self._server_table.remove_row(self._server_row_keys.pop(dest_hash_hex))
+            self._apply_server_rows(current)
             #DEBUG: self.write_debug_log("[DEBUG] Server list updated successfully.")
         except Exception as e:
-            self.server_list_update_pending = False
             self.write_debug_log(f"[ERROR] Error updating server list: {e}")
     
     def update_address_book(self):
         try:
-            address_book = self.query_one("#address_book", DataTable)
-            address_book.clear()
-            for server in self.address_book.values():
-                address_book.add_row(server["display_name"], server["hash"])
+            shown = {row_key.value for row_key in self._addr_table.rows}
+            for dest_hash in shown - self.address_book.keys():
+                self._addr_table.remove_row(dest_hash)
+            for dest_hash, server in self.address_book.items():
+                if dest_hash not in shown:
+                    self._addr_table.add_row(server["display_name"], dest_hash, key=dest_hash)
+                elif self._addr_table.get_cell(dest_hash, "name") != server["display_name"]:
+                    self._addr_table.update_cell(dest_hash, "name", server["display_name"])
                 #DEBUG: self.write_debug_log(f"[DEBUG] Added to address book: {server['display_name']} - {server['hash']}")
             #DEBUG: self.write_debug_log("[DEBUG] Address book updated successfully.")
         except Exception as e:
             self.write_debug_log(f"[ERROR] Error updating address book: {e}")
     
     def toggle_address_book(self, destination_hash, currently_saved):
-        if currently_saved:
-            del self.address_book[destination_hash]
-        else:
-            server = self.servers[destination_hash]
-            self.address_book[destination_hash] = server
-        self.save_address_book()
-        self.update_address_book()
+        if currently_saved != (destination_hash in self.address_book):
+            return
+        try:
+            if currently_saved:
+                del self.address_book[destination_hash]
+                self._addr_table.remove_row(destination_hash)
+            else:
+                server = self.get_server(bytes.fromhex(destination_hash))
+                self.address_book[destination_hash] = server._asdict()
+                self._addr_table.add_row(server.display_name, destination_hash, key=destination_hash)
+            self.mark_address_book_dirty()
+        except Exception as e:
+            self.write_debug_log(f"[ERROR] Error updating address book: {e}")
 
     def action_refresh_servers(self):
         self.write_log("[ACTION] Refreshing server list...")
-        server_list = self.query_one("#server_list", DataTable)
-        server_list.clear()
-        server_list.add_columns("Server Name", "Destination Hash")
-        for server in self.servers.values():
-            server_list.add_row(server["display_name"], server["hash"])
+        self.update_server_list()
     
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         try:
@@ -605,13 +879,13 @@ class RetiBBSClient(App):
                 row_data = triggering_table.get_row(event.row_key)
                 if row_data:
                     server_name, destination_hash = row_data
-                    server_info = self.servers.get(destination_hash)
+                    server_info = self.get_server(bytes.fromhex(destination_hash))
                     if server_info:
                         self.push_screen(
                             ServerDetailScreen(
-                                server_name=server_info["display_name"],
-                                destination_hash=server_info["hash"],
-                                timestamp=server_info["timestamp"],
+                                server_name=server_info.display_name,
+                                destination_hash=server_info.hash,
+                                timestamp=server_info.timestamp,
                                 on_connect=self.connect_client,
                                 saved_in_address_book=destination_hash in self.address_book,
                             )
@@ -654,9 +928,20 @@ if __name__ == "__main__":
         required=False,
         help="Hexadecimal hash of the RetiBBS server",
     )
+    parser.add_argument(
+        "--debug",
+        action="store_true",
+        help="Include raw packet dumps in the debug log (also enabled by RETIBBS_DEBUG)",
+    )
     args = parser.parse_args()
 
-    app = RetiBBSClient(server_hexhash=args.server)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
+    app = RetiBBSClient(server_hexhash=args.server, debug_mode=args.debug)
     app.reticulum_config_path = args.reticulum_config
     app.identity_file_path = args.identity_file
     app.run()
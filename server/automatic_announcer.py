@@ -2,6 +2,11 @@ import threading
 import time
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import RNS
 
 class AutomaticAnnouncer(threading.Thread):
@@ -16,7 +21,7 @@ class AutomaticAnnouncer(threading.Thread):
     def run(self):
         while not self.stop_event.is_set():
             time.sleep(self.interval)
-            announce_data = json.dumps({"server_name": self.server_name}).encode("utf-8")
+            announce_data = orjson.dumps({"server_name": self.server_name}) if orjson else json.dumps({"server_name": self.server_name}).encode("utf-8")
             self.server_destination.announce(app_data=announce_data)
             RNS.log("[Announcer] Sent automatic announce", RNS.LOG_DEBUG)
 
@@ -1,14 +1,50 @@
 import asyncio
 import math
+import re
 import time
 import sqlite3
 import threading
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from rich.markup import escape
 
 import RNS
 
+HELP_TEXT = (
+    "You are in the message boards area.\n\n"
+    "Available Commands:\n"
+    "  ?  | help                           - Show this help text\n"
+    "  b  | back                           - Return to main menu\n"
+    "  lb | listboards                     - List all boards\n"
+    "  cb | changeboard <boardname>        - Switch to a board (so you can post/list by default)\n"
+    "  w  | watch <boardname>              - Add a board to your watchlist\n"
+    "  uw | unwatch <boardname>            - Remove a board from your watchlist\n"
+    "  wl | watchlist                      - List boards you are watching\n"
+    "  p  | post <text>                    - Post a message to your current board\n"
+    "  lm | listmessages \[boardname]       - List messages in 'boardname' or your current board\n"
+    "  lu | listunread                     - List unread messages in your current board\n"
+    "  >  | next                           - Go to the next page of messages\n"
+    "  <  | prev                           - Go to the previous page of messages\n"
+    "  r  | read <message_id>              - Read a message by ID\n"
+    "  re | reply <message_id> | <content> - Reply to a message by ID\n"
+).encode("utf-8")
+ADMIN_HELP_TEXT = HELP_TEXT + (
+    "\n\nAdmin Commands:\n"
+    "  nb | newboard <name>          - Create a new board\n"
+    "  db | deleteboard <boardname>  - Delete a board\n"
+).encode("utf-8")
+UNKNOWN_COMMAND = b"UNKNOWN COMMAND\n"
+
+_BOARD_NAME_RE = re.compile(r"[^\W_]{3,20}")
+
+@lru_cache(maxsize=4096)
+def _fmt_ts(seconds):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(seconds))
+
+def format_timestamp(timestamp):
+    return _fmt_ts(int(timestamp))
+
 class BoardsManager:
     def __init__(self, users_manager, reply_manager, lxmf_handler, theme_manager, db_path='boards.db'):
         self.db_path = db_path
@@ -18,8 +54,33 @@ class BoardsManager:
         self.lxmf_handler = lxmf_handler
         self.reply_handler = reply_manager
         self.user_pages = {}
+        self._commands = self._build_command_table()
         self._initialize_database()
 
+    def _build_command_table(self):
+        commands = {}
+        for aliases, handler in (
+            (("?", "help"), lambda packet, remainder, user_hash: self.handle_help(packet, user_hash)),
+            (("b", "back"), lambda packet, remainder, user_hash: self.handle_back(packet, user_hash)),
+            (("lb", "listboards"), lambda packet, remainder, user_hash: self.handle_list_boards(packet)),
+            (("cb", "changeboard"), self.handle_change_board),
+            (("w", "watch"), self.handle_watch),
+            (("uw", "unwatch"), self.handle_unwatch),
+            (("wl", "watchlist"), lambda packet, remainder, user_hash: self.handle_watchlist(packet, user_hash)),
+            (("p", "post"), self.handle_post_message),
+            (("lm", "listmessages"), self.handle_list_messages),
+            (("lu", "listunread"), lambda packet, remainder, user_hash: self.handle_list_unread_messages(packet, user_hash)),
+            ((">", "next"), lambda packet, remainder, user_hash: self.handle_next_page(packet, user_hash)),
+            (("<", "prev"), lambda packet, remainder, user_hash: self.handle_prev_page(packet, user_hash)),
+            (("r", "read"), self.handle_read_message),
+            (("re", "reply"), self.handle_reply),
+            (("nb", "newboard"), self.handle_new_board),
+            (("db", "deleteboard"), self.handle_delete_board),
+        ):
+            for alias in aliases:
+                commands[alias] = handler
+        return commands
+
     def _initialize_database(self):
         """
         Initialize the SQLite database.
@@ -74,44 +135,15 @@ class BoardsManager:
         """
         Handle commands in the boards area.
         """
-        tokens = command.split(None, 1)
-        if not tokens:
-            self.reply_handler.send_link_reply(packet.link, "UNKNOWN COMMAND\n")
+        cmd, _, remainder = command.partition(" ")
+        if not cmd:
+            self.reply_handler.send_link_reply(packet.link, UNKNOWN_COMMAND)
             return
-        cmd = tokens[0].lower()
-        remainder = tokens[1] if len(tokens) > 1 else ""
-        if cmd in ["?", "help"]:
-            self.handle_help(packet, user_hash)
-        elif cmd in ["b", "back"]:
-            self.handle_back(packet, user_hash)
-        elif cmd in ["lb", "listboards"]:
-            self.handle_list_boards(packet)
-        elif cmd in ["cb", "changeboard"]:
-            self.handle_change_board(packet, remainder, user_hash)
-        elif cmd in ["w", "watch"]:
-            self.handle_watch(packet, remainder, user_hash)
-        elif cmd in ["uw", "unwatch"]:
-            self.handle_unwatch(packet, remainder, user_hash)
-        elif cmd in ["wl", "watchlist"]:
-            self.handle_watchlist(packet, user_hash)
-        elif cmd in ["p", "post"]:
-            self.handle_post_message(packet, remainder, user_hash)
-        elif cmd in ["lm", "listmessages"]:
-            self.handle_list_messages(packet, remainder, user_hash)
-        elif cmd in ["lu", "listunread"]:
-            self.handle_list_unread_messages(packet, user_hash)
-        elif cmd in [">", "next"]:
-            self.handle_next_page(packet, user_hash)
-        elif cmd in ["<", "prev"]:
-            self.handle_prev_page(packet, user_hash)
-        elif cmd in ["r", "read"]:
-            self.handle_read_message(packet, remainder, user_hash)
-        elif cmd in ["re", "reply"]:
-            self.handle_reply(packet, remainder, user_hash)
-        elif cmd in ["nb", "newboard"]:
-            self.handle_new_board(packet, remainder, user_hash)
-        elif cmd in ["db", "deleteboard"]:
-            self.handle_delete_board(packet, remainder, user_hash)
+        cmd = cmd.lower()
+        remainder = remainder.lstrip()
+        handler = self._commands.get(cmd)
+        if handler:
+            handler(packet, remainder, user_hash)
         else:
             self.reply_handler.send_link_reply(packet.link, f"Unknown command: {cmd} in board area.")
     
@@ -122,30 +154,7 @@ class BoardsManager:
         :param user_hash: The user's hash.
         """
         user = self.users_mgr.get_user(user_hash)
-        reply = (
-            "You are in the message boards area.\n\n"
-            "Available Commands:\n"
-            "  ?  | help                           - Show this help text\n"
-            "  b  | back                           - Return to main menu\n"
-            "  lb | listboards                     - List all boards\n"
-            "  cb | changeboard <boardname>        - Switch to a board (so you can post/list by default)\n"
-            "  w  | watch <boardname>              - Add a board to your watchlist\n"
-            "  uw | unwatch <boardname>            - Remove a board from your watchlist\n"
-            "  wl | watchlist                      - List boards you are watching\n"
-            "  p  | post <text>                    - Post a message to your current board\n"
-            "  lm | listmessages \[boardname]       - List messages in 'boardname' or your current board\n"
-            "  lu | listunread                     - List unread messages in your current board\n"
-            "  >  | next                           - Go to the next page of messages\n"
-            "  <  | prev                           - Go to the previous page of messages\n"
-            "  r  | read <message_id>              - Read a message by ID\n"
-            "  re | reply <message_id> | <content> - Reply to a message by ID\n"
-        )
-        if user.get("is_admin", False):
-            reply += (
-                "\n\nAdmin Commands:\n"
-                "  nb | newboard <name>          - Create a new board\n"
-                "  db | deleteboard <boardname>  - Delete a board\n"
-            )
+        reply = ADMIN_HELP_TEXT if user.get("is_admin", False) else HELP_TEXT
         self.reply_handler.send_resource_reply(packet.link, reply)
 
     def handle_back(self, packet, user_hash):
@@ -314,7 +323,7 @@ class BoardsManager:
             else:
                 lines = [f"Messages in board '{board_name}' (Page {current_page}/{total_pages}):"]
                 for message in posts:
-                    timestamp_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(message["timestamp"]))
+                    timestamp_str = format_timestamp(message["timestamp"])
                     lines.append(
                         f"[{message['id']}] {timestamp_str} | {escape(message['author'])} | {escape(message['topic'])} "
                         f"({message['reply_count']} replies)"
@@ -342,7 +351,7 @@ class BoardsManager:
         else:
             lines = [f"Unread messages in board '{board_name}':"]
             for m in unread_messages:
-                t_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(m["timestamp"]))
+                t_str = format_timestamp(m["timestamp"])
                 lines.append(f"[{m['id']}] {t_str} | {escape(m['author'])} | {escape(m['topic'])}")
             reply = "\n".join(lines)
         self.reply_handler.send_resource_reply(packet.link, reply)
@@ -396,7 +405,7 @@ class BoardsManager:
         try:
             message = self.get_message_by_id(message_id)
             if message:
-                t_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(message["timestamp"]))
+                t_str = format_timestamp(message["timestamp"])
                 reply = (
                     f"\n[bold]----- Message {message_id} -----[/]\n"
                     f"Timestamp: {t_str}\n"
@@ -407,10 +416,10 @@ class BoardsManager:
                 )
                 replies = self.list_replies(message_id)
                 if replies:
-                    reply += "\nReplies:\n"
-                    for r in replies:
-                        r_t_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r["timestamp"]))
-                        reply += f"  [{r['id']}] {r_t_str} | {escape(r['author'])}: {escape(r['content'])}\n"
+                    reply += "\nReplies:\n" + "".join(
+                        f"  [{r['id']}] {format_timestamp(r['timestamp'])} | {escape(r['author'])}: {escape(r['content'])}\n"
+                        for r in replies
+                    )
                 reply += "\nTo reply, use: reply <message_id> | <content>"
                 self.mark_message_as_read(user_hash, message_id)
             else:
@@ -564,7 +573,7 @@ class BoardsManager:
             self.reply_handler.send_link_reply(packet.link, f"Board '{board_name}' has been deleted.")
 
     def is_valid_board_name(self, board_name):
-        return board_name.isalnum() and 3 <= len(board_name) <= 20
+        return _BOARD_NAME_RE.fullmatch(board_name) is not None
 
     def post_message(self, board_name, author, topic, content, parent_id=None):
         """
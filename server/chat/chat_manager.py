@@ -2,6 +2,17 @@ from rich.markup import escape
 
 import RNS
 
+HELP_TEXT = (
+    "Available Chat Commands:\n"
+    "  /? - Show this help screen\n"
+    "  /back - Return to the main menu\n"
+    "  /join <room_name> - Join a chat room\n"
+    "  /leave - Leave the current chat room\n"
+    "  /list - List available chat rooms\n"
+    "  /msg <message> - Send a message to the current chat room\n"
+).encode("utf-8")
+UNKNOWN_COMMAND = b"UNKNOWN COMMAND\n"
+
 class ChatRoom:
     def __init__(self, name, chat_manager):
         self.name = name
@@ -42,6 +53,20 @@ class ChatManager:
         self.theme_mgr = theme_manager
         self.lxmf_handler = lxmf_handler
         self.reply_handler = reply_manager
+        self._commands = self._build_command_table()
+
+    def _build_command_table(self):
+        commands = {}
+        for aliases, handler in (
+            (("/?", "/help"), lambda packet, remainder, user_hash: self.handle_help(packet, user_hash)),
+            (("/b", "/back"), lambda packet, remainder, user_hash: self.handle_back(packet, user_hash)),
+            (("/j", "/join"), self.handle_join_room),
+            (("/l", "/leave"), self.handle_leave_room),
+            (("/list",), lambda packet, remainder, user_hash: self.handle_list_rooms(packet, user_hash)),
+        ):
+            for alias in aliases:
+                commands[alias] = handler
+        return commands
     
     def register_user_link(self, user_hash, link):
         """
@@ -80,22 +105,15 @@ class ChatManager:
         :param packet: The incoming packet.
         :param user_hash: The user's hash.
         """
-        tokens = command.split(None, 1)
-        if not tokens:
-            self.reply_handler.send_link_reply(packet.link, "UNKNOWN COMMAND\n")
+        cmd, _, remainder = command.partition(" ")
+        if not cmd:
+            self.reply_handler.send_link_reply(packet.link, UNKNOWN_COMMAND)
             return
-        cmd = tokens[0].lower()
-        remainder = tokens[1] if len(tokens) > 1 else ""
-        if cmd in ["/?", "/help"]:
-            self.handle_help(packet, user_hash)
-        elif cmd in ["/b", "/back"]:
-            self.handle_back(packet, user_hash)
-        elif cmd in ["/j", "/join"]:
-            self.handle_join_room(packet, remainder, user_hash)
-        elif cmd in ["/l", "/leave"]:
-            self.handle_leave_room(packet, remainder, user_hash)
-        elif cmd in ["/list"]:
-            self.handle_list_rooms(packet, user_hash)
+        cmd = cmd.lower()
+        remainder = remainder.lstrip()
+        handler = self._commands.get(cmd)
+        if handler:
+            handler(packet, remainder, user_hash)
         else:
             self.handle_chat_message(packet, command, user_hash)
     
@@ -104,17 +122,7 @@ class ChatManager:
         Show the help screen.
         :param packet: The incoming packet.
         """
-        user = self.users_mgr.get_user(user_hash)
-        help_text = (
-            "Available Chat Commands:\n"
-            "  /? - Show this help screen\n"
-            "  /back - Return to the main menu\n"
-            "  /join <room_name> - Join a chat room\n"
-            "  /leave - Leave the current chat room\n"
-            "  /list - List available chat rooms\n"
-            "  /msg <message> - Send a message to the current chat room\n"
-        )
-        self.reply_handler.send_resource_reply(packet.link, help_text)
+        self.reply_handler.send_resource_reply(packet.link, HELP_TEXT)
 
     def handle_back(self, packet, user_hash):
         """
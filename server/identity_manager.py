@@ -14,6 +14,8 @@ class IdentityManager:
             RNS.log(f"[Identity] Loaded server Identity from {self.identity_path}", RNS.LOG_INFO)
         else:
             server_identity = RNS.Identity()
-            server_identity.to_file(self.identity_path)
+            tmp_path = self.identity_path + ".tmp"
+            server_identity.to_file(tmp_path)
+            os.replace(tmp_path, self.identity_path)
             RNS.log(f"[Identity] Created new server Identity and saved to {self.identity_path}", RNS.LOG_INFO)
         return server_identity
\ No newline at end of file
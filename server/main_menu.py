@@ -3,6 +3,26 @@ from rich.markup import escape
 
 import RNS
 
+from users_manager import pretty_hash
+
+HELP_TEXT = (
+    "You are in the main menu.\n\n"
+    "Available Commands:\n"
+    "  ?  | help                  - Show this help text\n"
+    "  h  | hello                 - Check authorization\n"
+    "  n  | name <name>           - Set display name\n"
+    "  d  | destination <address> - Set LXMF destination address for message board alerts\n"
+    "  td | testdestination       - Test LXMF destination address\n"
+    "  b  | boards                - Switch to boards area\n"
+    "  lo | logout                - Log out"
+).encode("utf-8")
+ADMIN_HELP_TEXT = HELP_TEXT + (
+    "\n\nAdmin Commands:\n"
+    "  lu | listusers         - List all users\n"
+    "  a  | admin <user_hash> - Assign admin rights to a user"
+).encode("utf-8")
+UNKNOWN_COMMAND = b"UNKNOWN COMMAND\n"
+
 class MainMenuHandler:
     def __init__(self, users_manager, reply_handler, lxmf_handler, theme_manager, chat_manager):
         self.users_mgr = users_manager
@@ -10,38 +30,40 @@ class MainMenuHandler:
         self.lxmf_handler = lxmf_handler
         self.theme_mgr = theme_manager
         self.chat_mgr = chat_manager
+        self._commands = self._build_command_table()
+
+    def _build_command_table(self):
+        commands = {}
+        for aliases, handler in (
+            (("?", "help"), lambda packet, remainder, user_hash: self.handle_help(packet, user_hash)),
+            (("h", "hello"), lambda packet, remainder, user_hash: self.handle_hello(packet, user_hash)),
+            (("n", "name"), self.handle_name),
+            (("d", "destination"), self.handle_set_destination_address),
+            (("td", "testdestination"), lambda packet, remainder, user_hash: self.handle_test_destination(packet, user_hash)),
+            (("b", "boards"), lambda packet, remainder, user_hash: self.handle_boards(packet, user_hash)),
+            (("c", "chat"), lambda packet, remainder, user_hash: self.handle_chat(packet, user_hash)),
+            (("lo", "logout"), lambda packet, remainder, user_hash: self.handle_logout(packet)),
+            (("lu", "listusers"), lambda packet, remainder, user_hash: self.handle_list_users(packet, user_hash)),
+            (("a", "admin"), self.handle_admin),
+        ):
+            for alias in aliases:
+                commands[alias] = handler
+        return commands
 
     def handle_main_menu_commands(self, command, packet, user_hash):
         """
         Handle commands in the main menu area.
         """
-        tokens = command.split(None, 1)
-        if not tokens:
-            self.reply_handler.send_link_reply(packet.link, "UNKNOWN COMMAND\n")
+        cmd, _, remainder = command.partition(" ")
+        if not cmd:
+            self.reply_handler.send_link_reply(packet.link, UNKNOWN_COMMAND)
             return
-        cmd = tokens[0].lower()
-        remainder = tokens[1] if len(tokens) > 1 else ""
-
-        if cmd in ["?", "help"]:
-            self.handle_help(packet, user_hash)
-        elif cmd in ["h", "hello"]:
-            self.handle_hello(packet, user_hash)
-        elif cmd in ["n", "name"]:
-            self.handle_name(packet, remainder, user_hash)
-        elif cmd in ["d", "destination"]:
-            self.handle_set_destination_address(packet, remainder, user_hash)
-        elif cmd in ["td", "testdestination"]:
-            self.handle_test_destination(packet, user_hash)
-        elif cmd in ["b", "boards"]:
-            self.handle_boards(packet, user_hash)
-        elif cmd in ["c", "chat"]:
-            self.handle_chat(packet, user_hash)
-        elif cmd in ["lo", "logout"]:
-            self.handle_logout(packet)
-        elif cmd in ["lu", "listusers"]:
-            self.handle_list_users(packet, user_hash)
-        elif cmd in ["a", "admin"]:
-            self.handle_admin(packet, remainder, user_hash)
+        cmd = cmd.lower()
+        remainder = remainder.lstrip()
+
+        handler = self._commands.get(cmd)
+        if handler:
+            handler(packet, remainder, user_hash)
         else:
             self.reply_handler.send_link_reply(packet.link, "UNKNOWN COMMAND. Use '?' for help.")
 
@@ -50,23 +72,7 @@ class MainMenuHandler:
         Command to show the main menu help text.
         """
         user = self.users_mgr.get_user(user_hash)
-        reply = (
-            "You are in the main menu.\n\n"
-            "Available Commands:\n"
-            "  ?  | help                  - Show this help text\n"
-            "  h  | hello                 - Check authorization\n"
-            "  n  | name <name>           - Set display name\n"
-            "  d  | destination <address> - Set LXMF destination address for message board alerts\n"
-            "  td | testdestination       - Test LXMF destination address\n"
-            "  b  | boards                - Switch to boards area\n"
-            "  lo | logout                - Log out"
-        )
-        if user.get("is_admin", False):
-            reply += (
-                "\n\nAdmin Commands:\n"
-                "  lu | listusers         - List all users\n"
-                "  a  | admin <user_hash> - Assign admin rights to a user"
-            )
+        reply = ADMIN_HELP_TEXT if user.get("is_admin", False) else HELP_TEXT
         self.reply_handler.send_resource_reply(packet.link, reply)
 
     def handle_hello(self, packet, user_hash):
@@ -198,11 +204,13 @@ class MainMenuHandler:
         if not user_list:
             reply = "No users found."
         else:
-            reply = "Users:\n"
+            lines = ["Users:"]
             for user in user_list:
                 name = user["name"] if user["name"] else "N/A"
                 admin_status = " (Admin)" if user["is_admin"] else ""
-                reply += f"- {user['hash_hex']} | {escape(name)} {admin_status}\n"
+                lines.append(f"- {user['hash_hex']} | {escape(name)} {admin_status}")
+            lines.append("")
+            reply = "\n".join(lines)
         self.reply_handler.send_resource_reply(packet.link, reply)
     
     def handle_admin(self, packet, remainder, user_hash):
@@ -225,5 +233,5 @@ class MainMenuHandler:
             return
 
         self.users_mgr.update_user(target_hash, is_admin=True)
-        target_display_name = self.users_mgr.get_user_display(target_hash)
+        target_display_name = target_user.get("name") or pretty_hash(target_hash)
         self.reply_handler.send_link_reply(packet.link, f"User {escape(target_display_name)} has been granted admin rights.")
\ No newline at end of file
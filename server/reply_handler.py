@@ -9,10 +9,10 @@ class ReplyHandler:
         """
         Send a reply to a link.
         :param link: The link to reply to.
-        :param text: The text to send.
+        :param text: The text to send, as str or already-encoded bytes.
         """
         try:
-            data = text.encode("utf-8")
+            data = text if isinstance(text, (bytes, bytearray)) else text.encode("utf-8")
             if link.destination.hash == RNS.Transport.identity.hash:
                 RNS.log(f"[ERROR] Attempted to send packet to self. Destination hash: {RNS.prettyhexrep(link.destination.hash)}", RNS.LOG_ERROR)
                 return
@@ -27,10 +27,10 @@ class ReplyHandler:
         """
         Send a resource reply to a link.
         :param link: The link to reply to.
-        :param text: The text to send.
+        :param text: The text to send, as str or already-encoded bytes.
         """
         try:
-            data = text.encode("utf-8")
+            data = text if isinstance(text, (bytes, bytearray)) else text.encode("utf-8")
             resource = RNS.Resource(data, link)
             RNS.log(f"[ReplyHandler] Sent resource reply (length={len(data)} bytes)", RNS.LOG_DEBUG)
         except Exception as e:
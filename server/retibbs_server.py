@@ -4,6 +4,12 @@ import os
 import json
 import sys
 import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 import RNS
 
@@ -15,10 +21,12 @@ from lxmf_handler import LXMFHandler
 from main_menu import MainMenuHandler
 from reply_handler import ReplyHandler
 from theme_manager import ThemeManager
-from users_manager import UsersManager
+from users_manager import UsersManager, pretty_hash
 from web.web_server import WebServer
 
 class RetiBBSServer:
+    MANUAL_ANNOUNCE_MIN_INTERVAL = 1.0
+
     def __init__(
             self,
             configpath,
@@ -43,7 +51,6 @@ class RetiBBSServer:
         self.main_menu_handler = MainMenuHandler(self.users_mgr, self.reply_handler, None, self.theme_mgr, self.chat_mgr)
         self.boards_mgr = BoardsManager(self.users_mgr, self.reply_handler, None, self.theme_mgr)
         self.web_server = None
-        self.latest_client_link = None
         self.server_identity = None
         self.server_destination = None
         self.announcer = None
@@ -98,10 +105,15 @@ class RetiBBSServer:
     def run(self):
         if self.enable_web_server:
             self.start_web_server()
+        last_announce = 0.0
         while True:
             try:
                 RNS.log("[Server] Waiting for incoming connections... Press Enter to send an ANNOUNCE.", RNS.LOG_INFO)
                 input()
+                now = time.monotonic()
+                if now - last_announce < self.MANUAL_ANNOUNCE_MIN_INTERVAL:
+                    continue
+                last_announce = now
                 RNS.log("[Server] Sending manual announce...", RNS.LOG_INFO)
                 self.send_announce()
             except KeyboardInterrupt:
@@ -110,7 +122,7 @@ class RetiBBSServer:
                 break
 
     def send_announce(self):
-        announce_data = json.dumps({"server_name": self.server_name}).encode("utf-8")
+        announce_data = orjson.dumps({"server_name": self.server_name}) if orjson else json.dumps({"server_name": self.server_name}).encode("utf-8")
         self.server_destination.announce(app_data=announce_data)
         RNS.log("[Server] Sent announce from " + RNS.prettyhexrep(self.server_destination.hash), RNS.LOG_DEBUG)
 
@@ -129,10 +141,10 @@ class RetiBBSServer:
     def client_connected(self, link):
         RNS.log("[Server] Client link established!", RNS.LOG_DEBUG)
 
+        link._bbs_state = {"identity_hash_hex": None}
         link.set_link_closed_callback(self.client_disconnected)
         link.set_packet_callback(self.server_packet_received)
         link.set_remote_identified_callback(self.remote_identified)
-        self.latest_client_link = link
 
         # FUTURE: automatically accept inbound resources from the client:
         # link.set_resource_strategy(RNS.Link.ACCEPT_ALL)
@@ -152,6 +164,7 @@ class RetiBBSServer:
 
     def remote_identified(self, link, identity):
         identity_hash_hex = identity.hash.hex()
+        link._bbs_state["identity_hash_hex"] = identity_hash_hex
 
         RNS.log(f"[Server] Remote identified as {RNS.prettyhexrep(bytes.fromhex(identity_hash_hex))}", RNS.LOG_DEBUG)
 
@@ -178,21 +191,11 @@ class RetiBBSServer:
         RNS.log(f"[LXMF] Message delivered: {message.title if message.title else 'No Title'}", RNS.LOG_INFO)
 
     def server_packet_received(self, message_bytes, packet):
-        remote_identity = packet.link.get_remote_identity()
-        if not remote_identity:
+        identity_hash_hex = packet.link._bbs_state["identity_hash_hex"]
+        if not identity_hash_hex:
             RNS.log("[Server] Received data from an unidentified peer.", RNS.LOG_WARNING)
             return
 
-        identity_hash_hex = remote_identity.hash.hex()
-        user = self.users_mgr.get_user(identity_hash_hex)
-
-        if not user:
-            RNS.log("[Server] Received data from an unknown user.", RNS.LOG_WARNING)
-            return
-
-        user_area = self.users_mgr.get_user_area(identity_hash_hex)
-        user_display_name = user.get("name", RNS.prettyhexrep(bytes.fromhex(identity_hash_hex)))
-
         if message_bytes == b"PING":
             try:
                 reply_packet = RNS.Packet(packet.link, b"PONG")
@@ -202,12 +205,23 @@ class RetiBBSServer:
                 RNS.log(f"[Server] Error sending PONG: {e}", RNS.LOG_ERROR)
             return
         else:
-            try:
-                msg_str = message_bytes.decode("utf-8").strip()
-            except:
-                RNS.log("[Server] Error decoding message!", RNS.LOG_ERROR)
+            user = self.users_mgr.get_user(identity_hash_hex)
+            if not user:
+                RNS.log("[Server] Received data from an unknown user.", RNS.LOG_WARNING)
                 return
 
+            user_area = self.users_mgr.get_user_area(identity_hash_hex)
+            user_display_name = user.get("name") or pretty_hash(identity_hash_hex)
+
+            if message_bytes.isascii():
+                msg_str = message_bytes.decode("ascii").strip()
+            else:
+                try:
+                    msg_str = message_bytes.decode("utf-8").strip()
+                except UnicodeDecodeError:
+                    RNS.log("[Server] Error decoding message!", RNS.LOG_ERROR)
+                    return
+
             RNS.log(f"[Server] Received: {msg_str} from {user_display_name}", RNS.LOG_DEBUG)
             RNS.log(f"[Server] User area: {user_area}", RNS.LOG_DEBUG)
 
@@ -248,8 +262,9 @@ if __name__ == "__main__":
 
         if os.path.isfile(args.config_file):
             try:
-                with open(args.config_file, "r", encoding="utf-8") as f:
-                    server_config = json.load(f)
+                with open(args.config_file, "rb") as f:
+                    data = f.read()
+                server_config = orjson.loads(data) if orjson else json.loads(data)
                 server_name = server_config.get("server_name", "RetiBBS Server")
                 announce_interval = server_config.get("announce_interval", 0)
                 enable_web_server = server_config.get("enable_web_server", False)
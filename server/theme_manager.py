@@ -2,6 +2,11 @@ import os
 import shutil
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import RNS
 
 class ThemeManager:
@@ -17,9 +22,10 @@ class ThemeManager:
         Load the configuration file to get the selected theme.
         """
         if os.path.exists(self.config_file):
-            with open(self.config_file, "r", encoding="utf-8") as file:
-                config = json.load(file)
-                self.selected_theme = config.get("theme", self.default_theme)
+            with open(self.config_file, "rb") as file:
+                data = file.read()
+            config = orjson.loads(data) if orjson else json.loads(data)
+            self.selected_theme = config.get("theme", self.default_theme)
         else:
             self.selected_theme = self.default_theme
 
@@ -1,8 +1,14 @@
 import sqlite3
 import threading
 
+from functools import lru_cache
+
 import RNS
 
+@lru_cache(maxsize=1024)
+def pretty_hash(hash_hex):
+    return RNS.prettyhexrep(bytes.fromhex(hash_hex))
+
 class UsersManager:
     def __init__(self, db_path='users.db'):
         self.db_path = db_path
@@ -10,11 +16,18 @@ class UsersManager:
         self.user_sessions = {}
         self._initialize_database()
 
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # With WAL, NORMAL syncs on checkpoint rather than on every commit.
+        conn.execute("PRAGMA synchronous = NORMAL;")
+        return conn
+
     def _initialize_database(self):
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
+                cursor.execute("PRAGMA journal_mode = WAL;")
 
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS users (
@@ -25,6 +38,9 @@ class UsersManager:
                         is_admin BOOLEAN DEFAULT 0
                     );
                 """)
+                cursor.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_users_name ON users (name);
+                """)
                 conn.commit()
                 RNS.log(f"[UsersManager] Database initialized at {self.db_path}", RNS.LOG_INFO)
             except Exception as e:
@@ -40,7 +56,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 if exclude_hash_hex:
                     cursor.execute("""
@@ -67,7 +83,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO users (hash_hex, name, is_admin) 
@@ -89,7 +105,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT hash_hex, name, destination_address, is_admin FROM users WHERE hash_hex = ?;
@@ -116,7 +132,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT hash_hex, name, destination_address, is_admin FROM users WHERE name = ?;
@@ -144,7 +160,7 @@ class UsersManager:
         user = self.get_user(hash_hex)
         if user and user["name"]:
             return user["name"]
-        return RNS.prettyhexrep(bytes.fromhex(hash_hex))
+        return pretty_hash(hash_hex)
 
     def update_user(self, hash_hex, name=None, is_admin=None):
         """
@@ -155,7 +171,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 updates = []
                 params = []
@@ -186,7 +202,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("SELECT hash_hex, name, is_admin FROM users;")
                 return [{"hash_hex": row[0], "name": row[1], "is_admin": row[2]} for row in cursor.fetchall()]
@@ -204,7 +220,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE users
@@ -225,7 +241,7 @@ class UsersManager:
         """
         with self.lock:
             try:
-                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn = self._connect()
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT destination_address FROM users WHERE hash_hex = ?;
@@ -243,25 +259,25 @@ class UsersManager:
         Retrieve the current area for a user.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash in self.user_sessions:
-            return self.user_sessions[user_hash].get("current_area", "main_menu")
+        session = self.user_sessions.get(user_hash)
+        if session is not None:
+            return session.get("current_area", "main_menu")
     
     def set_user_area(self, user_hash, area):
         """
         Set the current area for a user.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash not in self.user_sessions:
-            self.user_sessions[user_hash] = {}
-        self.user_sessions[user_hash]["current_area"] = area
+        self.user_sessions.setdefault(user_hash, {})["current_area"] = area
 
     def get_user_board(self, user_hash):
         """
         Retrieve the current board for a user.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash in self.user_sessions:
-            return self.user_sessions[user_hash].get("current_board", None)
+        session = self.user_sessions.get(user_hash)
+        if session is not None:
+            return session.get("current_board", None)
         
     def set_user_board(self, user_hash, board):
         """
@@ -269,17 +285,16 @@ class UsersManager:
         :param user_hash: The user's hash_hex.
         :param board: The board name.
         """
-        if user_hash not in self.user_sessions:
-            self.user_sessions[user_hash] = {}
-        self.user_sessions[user_hash]["current_board"] = board
+        self.user_sessions.setdefault(user_hash, {})["current_board"] = board
     
     def get_user_room(self, user_hash):
         """
         Retrieve the current room for a user.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash in self.user_sessions:
-            return self.user_sessions[user_hash].get("current_room", None)
+        session = self.user_sessions.get(user_hash)
+        if session is not None:
+            return session.get("current_room", None)
         
     def set_user_room(self, user_hash, room):
         """
@@ -287,24 +302,21 @@ class UsersManager:
         :param user_hash: The user's hash_hex.
         :param room: The room name.
         """
-        if user_hash not in self.user_sessions:
-            self.user_sessions[user_hash] = {}
-        self.user_sessions[user_hash]["current_room"] = room
+        self.user_sessions.setdefault(user_hash, {})["current_room"] = room
     
     def remove_user_room(self, user_hash):
         """
         Remove the current room for a user.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash in self.user_sessions and "current_room" in self.user_sessions[user_hash]:
-            del self.user_sessions[user_hash]["current_room"]
+        session = self.user_sessions.get(user_hash)
+        if session is not None:
+            session.pop("current_room", None)
 
     def remove_user_session(self, user_hash):
         """
         Remove a user's session.
         :param user_hash: The user's hash_hex.
         """
-        if user_hash in self.user_sessions:
-            del self.user_sessions[user_hash]
-        else:
+        if self.user_sessions.pop(user_hash, None) is None:
             RNS.log(f"[UsersManager] User {user_hash} does not have an active session.", RNS.LOG_WARNING)
\ No newline at end of file